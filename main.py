@@ -21,20 +21,16 @@ def main() -> None:
 	_configure_logging()
 
 	# Import lazily so that environment variables from .env are available.
-	from tradingagents.default_config import DEFAULT_CONFIG
+	from tradingagents._env import as_bool
+	from tradingagents.default_config import build_default_config
 	from tradingagents.scheduler import TradingAgentsScheduler
 
-	debug_mode = os.getenv("TRADINGAGENTS_DEBUG", "false").lower() in {
-		"true",
-		"1",
-		"yes",
-		"on",
-	}
+	debug_mode = as_bool(os.getenv("TRADINGAGENTS_DEBUG", "false"))
 	timezone = os.getenv("TRADINGAGENTS_TIMEZONE")
 
 	try:
 		scheduler = TradingAgentsScheduler(
-			config=DEFAULT_CONFIG.copy(),
+			config=build_default_config(),
 			timezone=timezone,
 			debug=debug_mode,
 		)
@@ -0,0 +1,49 @@
+import os
+import unittest
+from datetime import time as dtime
+from unittest import mock
+
+from tradingagents import default_config
+from tradingagents.scheduler import TradingAgentsScheduler
+
+
+class DefaultConfigTest(unittest.TestCase):
+    def setUp(self):
+        default_config._load_default_config.cache_clear()
+        # Later tests must see the real environment again.
+        self.addCleanup(default_config._load_default_config.cache_clear)
+
+    def test_reads_return_independent_nested_dicts(self):
+        first = default_config.DEFAULT_CONFIG
+        second = default_config.DEFAULT_CONFIG
+        for key in ("email", "schedule", "whatsapp"):
+            with self.subTest(key=key):
+                self.assertEqual(first[key], second[key])
+                self.assertIsNot(first[key], second[key])
+
+        first["email"]["to"] = "someone@example.com"
+        first["schedule"]["times"] = "09:00"
+        self.assertNotEqual(second["email"]["to"], "someone@example.com")
+        self.assertNotEqual(default_config.DEFAULT_CONFIG["schedule"]["times"], "09:00")
+
+    def test_schedulers_do_not_share_nested_config(self):
+        first = TradingAgentsScheduler(schedule_times=[dtime(9, 0)])
+        second = TradingAgentsScheduler(schedule_times=[dtime(9, 0)])
+        self.assertIsNot(first.config["email"], second.config["email"])
+        self.assertIsNot(first.config["schedule"], second.config["schedule"])
+
+        first.config["email"]["host"] = "smtp.example.com"
+        self.assertNotEqual(second.config["email"]["host"], "smtp.example.com")
+        self.assertNotEqual(default_config.build_default_config()["email"]["host"], "smtp.example.com")
+
+    def test_environment_is_read_once(self):
+        with mock.patch.dict(os.environ, {"TRADINGAGENTS_TICKERS": "AAA"}):
+            self.assertEqual(default_config.DEFAULT_CONFIG["tickers"], "AAA")
+            os.environ["TRADINGAGENTS_TICKERS"] = "BBB"
+            self.assertEqual(default_config.DEFAULT_CONFIG["tickers"], "AAA")
+            self.assertEqual(default_config.build_default_config()["tickers"], "AAA")
+        self.assertEqual(default_config._load_default_config.cache_info().misses, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
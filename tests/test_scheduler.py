@@ -0,0 +1,510 @@
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from dataclasses import dataclass
+from datetime import datetime, time as dtime
+from pathlib import Path
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from tradingagents import scheduler
+from tradingagents.scheduler import (
+    TradingAgentsScheduler,
+    _MAX_JSON_DEPTH,
+    _make_json_safe,
+    _markdown_to_html,
+    _write_state_json,
+    next_run_after,
+    parse_schedule_times,
+)
+
+MADRID = ZoneInfo("Europe/Madrid")
+RUN_TIME = datetime(2026, 1, 5, 9, 0, tzinfo=MADRID)
+
+
+def _result(ticker: str, run_time: datetime = RUN_TIME, **overrides) -> scheduler.RunResult:
+    fields = dict(
+        ticker=ticker,
+        analysis_date=run_time.strftime("%Y-%m-%d"),
+        decision="BUY",
+        run_timestamp=run_time,
+        report_markdown="## Report",
+        report_dir=Path("./results"),
+    )
+    fields.update(overrides)
+    return scheduler.RunResult(**fields)
+
+
+def _frozen_datetime(now: datetime):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return now.astimezone(tz) if tz else now
+
+    return FrozenDatetime
+
+
+class _RecordingEvent:
+    """Stand-in for the stop event: records the wait and aborts the run."""
+
+    def __init__(self):
+        self.waits = []
+
+    def wait(self, timeout):
+        self.waits.append(timeout)
+        return True
+
+
+def _sleep_before_next_run(now: datetime, run_time: dtime, skip_weekends: bool = False) -> float:
+    with mock.patch.object(scheduler, "datetime", _frozen_datetime(now)):
+        instance = TradingAgentsScheduler(
+            config={"results_dir": "./results", "schedule": {"skip_weekends": skip_weekends}},
+            schedule_times=[run_time],
+            timezone="Europe/Madrid",
+        )
+        instance._stop = _RecordingEvent()
+        instance.run_pending()
+    return instance._stop.waits[0]
+
+
+class ParseScheduleTimesTest(unittest.TestCase):
+    def test_parses_and_sorts_valid_entries(self):
+        self.assertEqual(
+            parse_schedule_times("15:30, 9:05,,00:00"),
+            (dtime(0, 0), dtime(9, 5), dtime(15, 30)),
+        )
+
+    def test_rejects_what_strptime_rejected(self):
+        invalid = ["24:00", "12:60", "930", "9:30:00", "+9:30", "9 :30", "009:00", "0009:30", "10:005"]
+        self.assertEqual([entry for entry in invalid if _strptime_accepts(entry)], [])
+        for entry in invalid:
+            with self.subTest(entry=entry), self.assertLogs("tradingagents.scheduler", level="WARNING"):
+                self.assertEqual(parse_schedule_times(entry), ())
+
+    def test_rejects_non_ascii_digits(self):
+        for entry in ["\u0661:30", "1\u00b2:00"]:
+            with self.subTest(entry=entry), self.assertLogs("tradingagents.scheduler", level="WARNING"):
+                self.assertEqual(parse_schedule_times(entry), ())
+
+    def test_empty_input(self):
+        self.assertEqual(parse_schedule_times(None), ())
+        self.assertEqual(parse_schedule_times(""), ())
+
+
+def _strptime_accepts(entry: str) -> bool:
+    try:
+        datetime.strptime(entry, "%H:%M")
+    except ValueError:
+        return False
+    return True
+
+
+class NextRunAfterTest(unittest.TestCase):
+    def test_keeps_wall_clock_time_across_dst(self):
+        now = datetime(2026, 3, 28, 12, 0, tzinfo=MADRID)
+        run = next_run_after(now, dtime(9, 0), MADRID)
+        self.assertEqual(run.replace(tzinfo=None), datetime(2026, 3, 29, 9, 0))
+        self.assertEqual(run.utcoffset().total_seconds(), 2 * 3600)
+
+    def test_skips_weekends(self):
+        now = datetime(2026, 3, 28, 12, 0, tzinfo=MADRID)  # Saturday
+        run = next_run_after(now, dtime(9, 0), MADRID, skip_weekends=True)
+        self.assertEqual(run.replace(tzinfo=None), datetime(2026, 3, 30, 9, 0))
+
+
+class RunPendingSleepTest(unittest.TestCase):
+    def test_sleep_uses_real_elapsed_time_on_dst_day(self):
+        now = datetime(2026, 3, 29, 1, 0, tzinfo=MADRID)
+        self.assertEqual(_sleep_before_next_run(now, dtime(9, 0)), 7 * 3600)
+
+    def test_sleep_over_weekend_spanning_dst(self):
+        now = datetime(2026, 3, 28, 12, 0, tzinfo=MADRID)  # Saturday
+        sleep = _sleep_before_next_run(now, dtime(9, 0), skip_weekends=True)
+        self.assertEqual(sleep, 44 * 3600)
+
+    def test_sleep_on_regular_day(self):
+        now = datetime(2026, 10, 14, 8, 30, tzinfo=MADRID)
+        self.assertEqual(_sleep_before_next_run(now, dtime(9, 0)), 30 * 60)
+
+
+class ParallelismTest(unittest.TestCase):
+    def _scheduler(self, **config):
+        return TradingAgentsScheduler(
+            config={"results_dir": "./results", "max_parallel_tickers": 4, **config},
+            schedule_times=[dtime(9, 0)],
+        )
+
+    def test_ace_forces_sequential_tickers(self):
+        self.assertEqual(self._scheduler(ace_enabled=True).max_parallel, 1)
+        self.assertEqual(self._scheduler().max_parallel, 1)
+
+    def test_parallel_tickers_without_ace(self):
+        self.assertEqual(self._scheduler(ace_enabled=False).max_parallel, 4)
+
+    def test_sequential_batch_runs_in_calling_thread(self):
+        instance = self._scheduler(tickers="A,B,C")
+        threads = []
+
+        def run(ticker, run_time):
+            threads.append(threading.current_thread())
+            if ticker == "B":
+                raise KeyboardInterrupt
+            return _result(ticker, run_time)
+
+        with mock.patch.object(instance, "_run_single_ticker", side_effect=run), \
+                mock.patch.object(instance, "_send_notifications") as notify, \
+                mock.patch("builtins.print"):
+            with self.assertRaises(KeyboardInterrupt):
+                instance._execute_batch(RUN_TIME)
+        self.assertEqual(threads, [threading.main_thread()] * 2)
+        notify.assert_not_called()
+
+    def test_sequential_batch_skips_tickers_after_stop(self):
+        instance = self._scheduler(tickers="A,B,C")
+
+        def run(ticker, run_time):
+            instance.stop()
+            return _result(ticker, run_time)
+
+        with mock.patch.object(instance, "_run_single_ticker", side_effect=run) as run_mock, \
+                mock.patch.object(instance, "_send_notifications") as notify, \
+                mock.patch("builtins.print"):
+            instance._execute_batch(RUN_TIME)
+        self.assertEqual([c.args[0] for c in run_mock.call_args_list], ["A"])
+        self.assertEqual([r.ticker for r in notify.call_args.args[1]], ["A"])
+
+    def test_interrupt_cancels_queued_tickers(self):
+        instance = self._scheduler(ace_enabled=False, max_parallel_tickers=2, tickers="A,B,C,D")
+        started, gate, executors = [], threading.Event(), []
+
+        class RecordingExecutor(scheduler.ThreadPoolExecutor):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                executors.append(self)
+
+        def run(ticker, run_time):
+            started.append(ticker)
+            gate.wait(5)
+            return _result(ticker, run_time)
+
+        def interrupted(futures):
+            while len(started) < 2:
+                time.sleep(0.01)
+            raise KeyboardInterrupt
+
+        begin = time.monotonic()
+        with mock.patch.object(instance, "_run_single_ticker", side_effect=run), \
+                mock.patch.object(scheduler, "ThreadPoolExecutor", RecordingExecutor), \
+                mock.patch.object(scheduler, "as_completed", interrupted):
+            with self.assertRaises(KeyboardInterrupt):
+                instance._execute_batch(RUN_TIME)
+            # Raised while both running tickers were still blocked.
+            self.assertLess(time.monotonic() - begin, 1)
+            gate.set()
+            executors[0].shutdown(wait=True)
+        self.assertEqual(sorted(started), ["A", "B"])
+
+    def test_parallel_batch_skips_queued_tickers_after_stop(self):
+        instance = self._scheduler(ace_enabled=False, max_parallel_tickers=2, tickers="A,B,C,D")
+        b_started = threading.Event()
+
+        def run(ticker, run_time):
+            if ticker == "A":
+                b_started.wait(5)
+                instance.stop()
+            else:
+                b_started.set()
+                instance._stop.wait(5)
+            return _result(ticker, run_time)
+
+        with mock.patch.object(instance, "_run_single_ticker", side_effect=run) as run_mock, \
+                mock.patch.object(instance, "_send_notifications") as notify, \
+                mock.patch("builtins.print"):
+            instance._execute_batch(RUN_TIME)
+        self.assertEqual(sorted(c.args[0] for c in run_mock.call_args_list), ["A", "B"])
+        self.assertEqual([r.ticker for r in notify.call_args.args[1]], ["A", "B"])
+
+
+class NotifierConfigTest(unittest.TestCase):
+    def test_invalid_email_port_fails_at_startup(self):
+        with self.assertRaises(ValueError):
+            TradingAgentsScheduler(
+                config={"results_dir": "./results", "email": {"port": "not-a-port"}},
+                schedule_times=[dtime(9, 0)],
+            )
+
+    def test_no_messages_built_when_channels_disabled(self):
+        instance = TradingAgentsScheduler(
+            config={"results_dir": "./results"}, schedule_times=[dtime(9, 0)]
+        )
+        run_time = datetime(2026, 1, 5, 9, 0, tzinfo=MADRID)
+        result = scheduler.RunResult(
+            ticker="CL=F",
+            analysis_date="2026-01-05",
+            decision="BUY",
+            run_timestamp=run_time,
+            report_markdown="## Report",
+            report_dir=Path("./results"),
+        )
+        with mock.patch.object(scheduler, "_build_whatsapp_message") as whatsapp, \
+                mock.patch.object(scheduler, "_build_result_email_body") as email:
+            instance._send_notifications(run_time, [result])
+        whatsapp.assert_not_called()
+        email.assert_not_called()
+
+
+EMAIL_SETTINGS = {
+    "enabled": "true",
+    "host": "smtp.example.com",
+    "username": "bot",
+    "password": "secret",
+    "from": "bot@example.com",
+    "to": "desk@example.com",
+}
+
+
+class EmailBatchTest(unittest.TestCase):
+    def setUp(self):
+        self.scheduler = TradingAgentsScheduler(
+            config={"results_dir": "./results", "email": EMAIL_SETTINGS},
+            schedule_times=[dtime(9, 0)],
+        )
+        patcher = mock.patch("smtplib.SMTP")
+        self.smtp = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.server = self.smtp.return_value
+
+    def test_logs_in_once_for_the_whole_batch(self):
+        messages = [(f"subject {i}", "<p>body</p>") for i in range(3)]
+        outcomes = scheduler._send_email_batch(self.scheduler.email_config, messages)
+        self.assertEqual(outcomes, [None, None, None])
+        self.smtp.assert_called_once_with("smtp.example.com", 587)
+        self.server.login.assert_called_once_with("bot", "secret")
+        self.assertEqual(self.server.send_message.call_count, 3)
+
+    def test_failed_message_is_returned_and_the_rest_still_sent(self):
+        failure = OSError("mailbox full")
+        self.server.send_message.side_effect = [None, failure, None]
+        messages = [(f"subject {i}", "<p>body</p>") for i in range(3)]
+        outcomes = scheduler._send_email_batch(self.scheduler.email_config, messages)
+        self.assertEqual(outcomes, [None, failure, None])
+        self.assertEqual(self.server.send_message.call_count, 3)
+
+    def test_failed_message_is_logged_per_ticker(self):
+        self.server.send_message.side_effect = [None, OSError("mailbox full"), None]
+        results = [_result(ticker) for ticker in ("A", "B", "C")]
+        with self.assertLogs("tradingagents.scheduler", level="WARNING") as logs:
+            self.scheduler._send_notifications(RUN_TIME, results)
+        self.assertEqual(
+            [call.args[0]["Subject"] for call in self.server.send_message.call_args_list],
+            [f"TradingAgents - {t} - 2026-01-05 09:00" for t in ("A", "B", "C")],
+        )
+        self.assertIn("No fue posible enviar el correo para B: mailbox full", logs.output[0])
+        self.assertTrue(logs.output[-1].endswith("notificaciones: Email B: mailbox full"))
+
+    def test_login_failure_is_reported_once(self):
+        self.server.login.side_effect = OSError("bad credentials")
+        results = [_result(ticker) for ticker in ("A", "B", "C")]
+        with self.assertLogs("tradingagents.scheduler", level="WARNING") as logs:
+            self.scheduler._send_notifications(RUN_TIME, results)
+        self.server.send_message.assert_not_called()
+        summary = logs.output[-1].split("notificaciones: ", 1)[1]
+        self.assertEqual(summary, "Email: bad credentials")
+
+
+class WhatsAppSendTest(unittest.TestCase):
+    config = {
+        "enabled": True,
+        "access_token": "token",
+        "phone_number_id": "123",
+        "to": ["34600000001", "34600000002", "34600000003"],
+    }
+
+    def test_every_recipient_is_attempted_and_errors_are_combined(self):
+        def post(url, headers, json, timeout):
+            recipient = json["to"]
+            if recipient == "34600000002":
+                return mock.Mock(ok=False, status_code=500, text="internal error")
+            if recipient == "34600000003":
+                raise ConnectionError("connection reset")
+            return mock.Mock(ok=True)
+
+        session = mock.Mock()
+        session.post.side_effect = post
+        with mock.patch.object(scheduler, "_get_whatsapp_session", return_value=session):
+            with self.assertRaises(ValueError) as raised:
+                scheduler._send_whatsapp_message(self.config, "hola")
+
+        self.assertEqual(
+            sorted(call.kwargs["json"]["to"] for call in session.post.call_args_list),
+            self.config["to"],
+        )
+        for call in session.post.call_args_list:
+            self.assertEqual(call.kwargs["headers"], {"Authorization": "Bearer token"})
+        message = str(raised.exception)
+        self.assertIn("a 34600000002: 500 internal error", message)
+        self.assertIn("a 34600000003: connection reset", message)
+        self.assertNotIn("34600000001", message)
+
+
+class WriteOutputsTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.results_root = Path(tmp.name)
+
+    def _write(self, decision):
+        state = {"market_report": f"Market says {decision}", "final_trade_decision": decision}
+        report_dir, summary = scheduler._write_outputs(
+            "CL=F", RUN_TIME, self.results_root, state, decision
+        )
+        return report_dir, summary
+
+    def test_rerun_in_same_minute_refreshes_reports_copy(self):
+        self._write("BUY")
+        report_dir, summary = self._write("SELL")
+        primary = report_dir / "final_report.md"
+        mirror = report_dir / "reports" / "final_report.md"
+        self.assertEqual(primary.read_text(encoding="utf-8"), summary)
+        self.assertEqual(mirror.read_text(encoding="utf-8"), summary)
+        self.assertIn("SELL", summary)
+        self.assertTrue(os.path.samefile(primary, mirror))
+        self.assertEqual((report_dir / "decision.txt").read_text(encoding="utf-8"), "SELL")
+
+    def test_copies_report_when_hard_links_are_unsupported(self):
+        with mock.patch.object(scheduler.os, "link", side_effect=OSError("not supported")):
+            self._write("BUY")
+            report_dir, summary = self._write("SELL")
+        primary = report_dir / "final_report.md"
+        mirror = report_dir / "reports" / "final_report.md"
+        self.assertEqual(mirror.read_text(encoding="utf-8"), summary)
+        self.assertFalse(os.path.samefile(primary, mirror))
+
+
+class MarkdownToHtmlTest(unittest.TestCase):
+    def test_headings_and_escaping(self):
+        self.assertEqual(
+            _markdown_to_html("# T\n## S\n### <b>\n#### no\n\ntext & more"),
+            "<div><h1>T</h1><h2>S</h2><h3>&lt;b&gt;</h3><p>#### no</p>"
+            "<p>text &amp; more</p></div>",
+        )
+
+    def test_splits_on_every_splitlines_separator(self):
+        for separator in ("\r\n", "\r", "\x0b", "\x0c", "\x1c", "\x85", "\u2028", "\u2029"):
+            with self.subTest(separator=repr(separator)):
+                self.assertEqual(
+                    _markdown_to_html(f"x{separator}## y"),
+                    "<div><p>x</p><h2>y</h2></div>",
+                )
+
+    def test_empty_report(self):
+        self.assertEqual(_markdown_to_html(""), "<p><em>No hay informe disponible.</em></p>")
+
+
+def _nested_lists(depth: int) -> list:
+    root = current = []
+    for _ in range(depth - 1):
+        child = []
+        current.append(child)
+        current = child
+    current.append("leaf")
+    return root
+
+
+class _Message:
+    """Minimal stand-in for a LangChain message (exposes ``dict()``)."""
+
+    def __init__(self, type_, content):
+        self.type = type_
+        self.content = content
+
+    def dict(self):
+        return {"type": self.type, "content": self.content}
+
+
+@dataclass
+class _Signal:
+    ticker: str
+    generated_at: datetime
+    source: Path
+
+
+class _Ratio(float):
+    pass
+
+
+def _representative_state() -> dict:
+    run_time = datetime(2026, 1, 5, 9, 0, 30, 123456, tzinfo=MADRID)
+    return {
+        "messages": [_Message("human", "Analiza CL=F"), _Message("ai", "Compra ✅")],
+        "signal": _Signal("CL=F", run_time, Path("/tmp/results")),
+        "dates": [run_time, run_time.replace(tzinfo=None), run_time.date(), dtime(9, 5)],
+        "paths": (Path("results") / "CL=F",),
+        "tags": {"oil"},
+        "scores": [1.5, float("nan"), float("inf"), _Ratio(0.25), 10**16, True, None],
+        "nested": {"risk_debate_state": {"judge_decision": "HOLD", "history": [[], {}]}},
+    }
+
+
+class OrjsonParityTest(unittest.TestCase):
+    def _write_both(self, state, debug):
+        with tempfile.TemporaryDirectory() as tmp:
+            fast, slow = Path(tmp) / "fast.json", Path(tmp) / "slow.json"
+            _write_state_json(fast, state, debug)
+            with mock.patch.object(scheduler, "orjson", None):
+                _write_state_json(slow, state, debug)
+            return (
+                json.loads(fast.read_text(encoding="utf-8")),
+                json.loads(slow.read_text(encoding="utf-8")),
+            )
+
+    @unittest.skipUnless(scheduler.orjson, "orjson not installed")
+    def test_orjson_and_json_paths_agree(self):
+        for debug in (False, True):
+            with self.subTest(debug=debug), \
+                    mock.patch.object(scheduler, "_make_json_safe", wraps=_make_json_safe) as slow_path:
+                fast, slow = self._write_both(_representative_state(), debug)
+                # Only the forced json write converted the state.
+                self.assertEqual(slow_path.call_count, 1)
+                self.assertEqual(fast, slow)
+                self.assertEqual(fast["scores"], [1.5, None, None, 0.25, 10**16, True, None])
+                self.assertEqual(fast["signal"]["generated_at"], "2026-01-05T09:00:30.123456+01:00")
+
+    @unittest.skipUnless(scheduler.orjson, "orjson not installed")
+    def test_non_str_keys_are_stringified_like_json_path(self):
+        state = {
+            "keys": {None: 1, 2: "two", True: "yes", datetime(2026, 1, 5, 9, 0): "at"},
+            **_representative_state(),
+        }
+        fast, slow = self._write_both(state, debug=False)
+        self.assertEqual(fast, slow)
+        self.assertEqual(
+            sorted(fast["keys"]), ["2", "2026-01-05 09:00:00", "None", "True"]
+        )
+
+
+class JsonSafeTest(unittest.TestCase):
+    def test_deep_state_is_written_without_recursion_error(self):
+        state = {"messages": _nested_lists(_MAX_JSON_DEPTH - 1)}
+        with tempfile.TemporaryDirectory() as tmp, mock.patch.object(scheduler, "orjson", None):
+            path = Path(tmp) / "final_state.json"
+            for debug in (False, True):
+                _write_state_json(path, state, debug)
+                self.assertEqual(json.loads(path.read_text(encoding="utf-8")), state)
+
+    def test_rejects_states_beyond_depth_limit(self):
+        with self.assertRaises(ValueError):
+            _make_json_safe(_nested_lists(_MAX_JSON_DEPTH + 1))
+
+    def test_rejects_circular_references(self):
+        state = {}
+        state["self"] = state
+        with self.assertRaises(ValueError):
+            _make_json_safe(state)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,11 @@
+"""Helpers shared by the modules that coerce environment/config values."""
+
+from typing import Any, Final
+
+TRUTHY: Final[frozenset] = frozenset({"true", "1", "yes", "on"})
+
+
+def as_bool(value: Any) -> bool:
+    """Interpret ``value`` (bool, number or env-style string) as a flag."""
+
+    return str(value).strip().lower() in TRUTHY
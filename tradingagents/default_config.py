@@ -1,66 +1,92 @@
+import copy
 import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Mapping
 
+from tradingagents._env import as_bool
 
-def _split_env_list(var_name: str, default):
-    value = os.getenv(var_name)
+
+def _split_env_list(env: Mapping[str, str], var_name: str, default):
+    value = env.get(var_name)
     if not value:
         return default
     return [item.strip() for item in value.split(",") if item.strip()]
 
 
-DEFAULT_CONFIG = {
-    "project_dir": os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
-    "results_dir": os.getenv("TRADINGAGENTS_RESULTS_DIR", "./results"),
-    "data_dir": "/Users/yluo/Documents/Code/ScAI/FR1-data",
-    "data_cache_dir": os.path.join(
-        os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
-        "dataflows/data_cache",
-    ),
-    # LLM settings
-    "llm_provider": os.getenv("TRADINGAGENTS_LLM_PROVIDER", "openai"),
-    "deep_think_llm": os.getenv("TRADINGAGENTS_DEEP_THINK_LLM", "o4-mini"),
-    "quick_think_llm": os.getenv("TRADINGAGENTS_QUICK_THINK_LLM", "gpt-4o-mini"),
-    "backend_url": os.getenv("TRADINGAGENTS_BACKEND_URL", "https://api.openai.com/v1"),
-    # Debate and discussion settings
-    "max_debate_rounds": int(os.getenv("TRADINGAGENTS_MAX_DEBATE_ROUNDS", 1)),
-    "max_risk_discuss_rounds": int(os.getenv("TRADINGAGENTS_MAX_RISK_ROUNDS", 1)),
-    "max_recur_limit": int(os.getenv("TRADINGAGENTS_MAX_RECUR_LIMIT", 100)),
-    # Tool settings
-    "online_tools": os.getenv("TRADINGAGENTS_ONLINE_TOOLS", "true").lower() in {"true", "1", "yes", "on"},
-    # Default analyst selection
-    "selected_analysts": _split_env_list(
-        "TRADINGAGENTS_ANALYSTS",
-        ["market", "social", "news", "fundamentals"],
-    ),
-    # Scheduler defaults
-    "schedule": {
-        "times": os.getenv("TRADINGAGENTS_SCHEDULE_TIMES"),
-        "timezone": os.getenv("TRADINGAGENTS_TIMEZONE", "Europe/Madrid"),
-        "skip_weekends": os.getenv("TRADINGAGENTS_SKIP_WEEKENDS", "false").lower() in {"true", "1", "yes", "on"},
-    },
-    "tickers": os.getenv(
-        "TRADINGAGENTS_TICKERS",
-        "CL=F,EURUSD=X",
-    ),
-    "email": {
-        "enabled": os.getenv("TRADINGAGENTS_EMAIL_ENABLED", "false"),
-        "host": os.getenv("TRADINGAGENTS_EMAIL_HOST"),
-        "port": os.getenv("TRADINGAGENTS_EMAIL_PORT", "587"),
-        "username": os.getenv("TRADINGAGENTS_EMAIL_USERNAME"),
-        "password": os.getenv("TRADINGAGENTS_EMAIL_PASSWORD"),
-        "from": os.getenv("TRADINGAGENTS_EMAIL_FROM"),
-        "to": os.getenv("TRADINGAGENTS_EMAIL_TO"),
-        "use_ssl": os.getenv("TRADINGAGENTS_EMAIL_USE_SSL", "false"),
-    },
-    "whatsapp": {
-        "enabled": os.getenv("TRADINGAGENTS_WHATSAPP_ENABLED", "false"),
-        "access_token": os.getenv("TRADINGAGENTS_WHATSAPP_ACCESS_TOKEN"),
-        "phone_number_id": os.getenv("TRADINGAGENTS_WHATSAPP_PHONE_NUMBER_ID"),
-        "to": os.getenv("TRADINGAGENTS_WHATSAPP_TO"),
-    },
-    # ACE (Agentic Context Engineering) settings
-    "ace_enabled": os.getenv("TRADINGAGENTS_ACE_ENABLED", "true").lower() in {"true", "1", "yes", "on"},
-    "ace_skillbook_path": os.getenv("TRADINGAGENTS_ACE_SKILLBOOK_PATH"),
-    "ace_max_skills": int(os.getenv("TRADINGAGENTS_ACE_MAX_SKILLS", 15)),
-    "ace_learning": os.getenv("TRADINGAGENTS_ACE_LEARNING", "true").lower() in {"true", "1", "yes", "on"},
-}
+@lru_cache(maxsize=1)
+def _load_default_config() -> Mapping[str, Any]:
+    """Snapshot the environment once and return the read-only default config."""
+
+    env = dict(os.environ)
+    project_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "."))
+    config: Dict[str, Any] = {
+        "project_dir": project_dir,
+        "results_dir": env.get("TRADINGAGENTS_RESULTS_DIR", "./results"),
+        "data_dir": "/Users/yluo/Documents/Code/ScAI/FR1-data",
+        "data_cache_dir": os.path.join(project_dir, "dataflows/data_cache"),
+        # LLM settings
+        "llm_provider": env.get("TRADINGAGENTS_LLM_PROVIDER", "openai"),
+        "deep_think_llm": env.get("TRADINGAGENTS_DEEP_THINK_LLM", "o4-mini"),
+        "quick_think_llm": env.get("TRADINGAGENTS_QUICK_THINK_LLM", "gpt-4o-mini"),
+        "backend_url": env.get("TRADINGAGENTS_BACKEND_URL", "https://api.openai.com/v1"),
+        # Debate and discussion settings
+        "max_debate_rounds": int(env.get("TRADINGAGENTS_MAX_DEBATE_ROUNDS", 1)),
+        "max_risk_discuss_rounds": int(env.get("TRADINGAGENTS_MAX_RISK_ROUNDS", 1)),
+        "max_recur_limit": int(env.get("TRADINGAGENTS_MAX_RECUR_LIMIT", 100)),
+        # Tool settings
+        "online_tools": as_bool(env.get("TRADINGAGENTS_ONLINE_TOOLS", "true")),
+        # Default analyst selection
+        "selected_analysts": _split_env_list(
+            env,
+            "TRADINGAGENTS_ANALYSTS",
+            ["market", "social", "news", "fundamentals"],
+        ),
+        # Scheduler defaults
+        "schedule": {
+            "times": env.get("TRADINGAGENTS_SCHEDULE_TIMES"),
+            "timezone": env.get("TRADINGAGENTS_TIMEZONE", "Europe/Madrid"),
+            "skip_weekends": as_bool(env.get("TRADINGAGENTS_SKIP_WEEKENDS", "false")),
+        },
+        "tickers": env.get(
+            "TRADINGAGENTS_TICKERS",
+            "CL=F,EURUSD=X",
+        ),
+        "max_parallel_tickers": int(env.get("TRADINGAGENTS_MAX_PARALLEL", 4)),
+        "email": {
+            "enabled": env.get("TRADINGAGENTS_EMAIL_ENABLED", "false"),
+            "host": env.get("TRADINGAGENTS_EMAIL_HOST"),
+            "port": env.get("TRADINGAGENTS_EMAIL_PORT", "587"),
+            "username": env.get("TRADINGAGENTS_EMAIL_USERNAME"),
+            "password": env.get("TRADINGAGENTS_EMAIL_PASSWORD"),
+            "from": env.get("TRADINGAGENTS_EMAIL_FROM"),
+            "to": env.get("TRADINGAGENTS_EMAIL_TO"),
+            "use_ssl": env.get("TRADINGAGENTS_EMAIL_USE_SSL", "false"),
+        },
+        "whatsapp": {
+            "enabled": env.get("TRADINGAGENTS_WHATSAPP_ENABLED", "false"),
+            "access_token": env.get("TRADINGAGENTS_WHATSAPP_ACCESS_TOKEN"),
+            "phone_number_id": env.get("TRADINGAGENTS_WHATSAPP_PHONE_NUMBER_ID"),
+            "to": env.get("TRADINGAGENTS_WHATSAPP_TO"),
+        },
+        # ACE (Agentic Context Engineering) settings
+        "ace_enabled": as_bool(env.get("TRADINGAGENTS_ACE_ENABLED", "true")),
+        "ace_skillbook_path": env.get("TRADINGAGENTS_ACE_SKILLBOOK_PATH"),
+        "ace_max_skills": int(env.get("TRADINGAGENTS_ACE_MAX_SKILLS", 15)),
+        "ace_learning": as_bool(env.get("TRADINGAGENTS_ACE_LEARNING", "true")),
+    }
+    return MappingProxyType(config)
+
+
+def build_default_config() -> Dict[str, Any]:
+    """Return a fresh, fully independent copy of the default configuration."""
+
+    return copy.deepcopy(dict(_load_default_config()))
+
+
+def __getattr__(name: str) -> Any:
+    # ``DEFAULT_CONFIG`` is resolved lazily (PEP 562) so the environment is read
+    # on first use, and every access gets its own copy of the nested dicts.
+    if name == "DEFAULT_CONFIG":
+        return build_default_config()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,29 +2,42 @@
 
 from __future__ import annotations
 
+import copy
+import heapq
 import html
 import json
 import logging
+import math
 import os
-import smtplib
-import ssl
-import time
+import shutil
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, is_dataclass
-from datetime import datetime, timedelta, time as dtime, tzinfo
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
+from datetime import date, datetime, timedelta, time as dtime, tzinfo
+from functools import cached_property, lru_cache, singledispatch
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
 
-import pytz
-import requests
+try:  # Optional: serialises final_state in C when available.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
 
-from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents._env import as_bool
+from tradingagents.default_config import build_default_config
+
+if TYPE_CHECKING:
+    from email.mime.multipart import MIMEMultipart
+
+    import requests
 
 
 LOGGER = logging.getLogger("tradingagents.scheduler")
 
+# datetime.weekday() values for Saturday and Sunday.
+_WEEKEND = frozenset({5, 6})
 
 @dataclass
 class RunResult:
@@ -49,102 +62,160 @@ def _ensure_list(value: Optional[str], default: Sequence[str]) -> List[str]:
     return [item.strip() for item in value.split(",") if item.strip()]
 
 
-def parse_schedule_times(times_config: Optional[str]) -> List[dtime]:
-    """Parse HH:MM schedule strings into :class:`datetime.time` instances."""
+@lru_cache(maxsize=32)
+def parse_schedule_times(times_config: Optional[str]) -> Tuple[dtime, ...]:
+    """Parse HH:MM schedule strings into :class:`datetime.time` instances.
+
+    Results are cached per input string, so a tuple is returned to keep the
+    shared value immutable.
+    """
 
     if not times_config:
-        return []
+        return ()
 
     schedule: List[dtime] = []
     for raw_time in times_config.split(","):
         candidate = raw_time.strip()
         if not candidate:
             continue
+        hours, _, minutes = candidate.partition(":")
+        # Same shape strptime("%H:%M") accepted: one or two ASCII digits each.
+        if not all(
+            0 < len(part) <= 2 and part.isascii() and part.isdigit()
+            for part in (hours, minutes)
+        ):
+            LOGGER.warning("Skipping invalid schedule entry '%s': expected HH:MM", candidate)
+            continue
         try:
-            parsed = datetime.strptime(candidate, "%H:%M").time()
-        except ValueError as exc:  # pragma: no cover - defensive branch
+            parsed = dtime(int(hours), int(minutes))
+        except ValueError as exc:
             LOGGER.warning("Skipping invalid schedule entry '%s': %s", candidate, exc)
             continue
         schedule.append(parsed)
-    return sorted(schedule)
+    return tuple(sorted(schedule))
 
 
 def next_run_after(now: datetime, run_time: dtime, tz: tzinfo, skip_weekends: bool = False) -> datetime:
     """Return the next datetime at which ``run_time`` should execute."""
 
-    candidate = tz.localize(datetime.combine(now.date(), run_time))
+    candidate = datetime.combine(now.date(), run_time, tzinfo=tz)
     if candidate <= now:
         candidate += timedelta(days=1)
 
     if skip_weekends:
-        # 0=Monday, 1=Tuesday, ..., 4=Friday, 5=Saturday, 6=Sunday
-        while candidate.weekday() >= 5:
+        while candidate.weekday() in _WEEKEND:
             candidate += timedelta(days=1)
 
     return candidate
 
 
+_ANALYST_SECTIONS: Tuple[Tuple[str, str], ...] = (
+    ("market_report", "Market Analysis"),
+    ("sentiment_report", "Social Sentiment"),
+    ("news_report", "News Analysis"),
+    ("fundamentals_report", "Fundamentals Analysis"),
+)
+
+# (path into final_state, heading) for the sections that follow the analysts.
+_DECISION_SECTIONS: Tuple[Tuple[Tuple[str, ...], str], ...] = (
+    (("investment_plan",), "Research Team Decision"),
+    (("trader_investment_plan",), "Trading Team Plan"),
+    (("risk_debate_state", "judge_decision"), "Portfolio Management Decision"),
+    (("final_trade_decision",), "Final Trade Decision"),
+)
+
+
+def _section_text(content: Any) -> str:
+    return content.strip() if isinstance(content, str) else str(content)
+
+
+def _iter_report_sections(final_state: Dict[str, Any]) -> Iterator[str]:
+    analyst_heading_pending = True
+    for key, title in _ANALYST_SECTIONS:
+        content = final_state.get(key)
+        if not content:
+            continue
+        if analyst_heading_pending:
+            analyst_heading_pending = False
+            yield "## Analyst Team Reports"
+        yield f"### {title}\n{_section_text(content)}"
+
+    for path, heading in _DECISION_SECTIONS:
+        content: Any = final_state
+        for key in path:
+            content = content.get(key) if isinstance(content, dict) else None
+        if content:
+            yield f"## {heading}"
+            yield _section_text(content)
+
+
 def _build_report(final_state: Dict[str, Any]) -> str:
-    sections: List[str] = []
+    return "\n\n".join(_iter_report_sections(final_state)).strip()
 
-    analyst_sections = {
-        "market_report": "Market Analysis",
-        "sentiment_report": "Social Sentiment",
-        "news_report": "News Analysis",
-        "fundamentals_report": "Fundamentals Analysis",
-    }
-    analyst_content = [
-        f"### {title}\n{final_state.get(key, '').strip()}"
-        for key, title in analyst_sections.items()
-        if final_state.get(key)
-    ]
-    if analyst_content:
-        sections.append("## Analyst Team Reports")
-        sections.extend(analyst_content)
 
-    research = final_state.get("investment_plan")
-    if research:
-        sections.append("## Research Team Decision")
-        sections.append(research.strip())
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Expose ``source`` at ``target`` via a hard link, copying if unsupported."""
 
-    trader_plan = final_state.get("trader_investment_plan")
-    if trader_plan:
-        sections.append("## Trading Team Plan")
-        sections.append(trader_plan.strip())
+    # A previous run in the same minute may have left a link to the old inode.
+    target.unlink(missing_ok=True)
+    try:
+        os.link(source, target)
+    except OSError:
+        shutil.copyfile(source, target)
 
-    risk_plan = final_state.get("risk_debate_state", {}).get("judge_decision")
-    if risk_plan:
-        sections.append("## Portfolio Management Decision")
-        sections.append(risk_plan.strip())
 
-    final_decision = final_state.get("final_trade_decision")
-    if final_decision:
-        sections.append("## Final Trade Decision")
-        sections.append(final_decision.strip())
+def _write_state_json(path: Path, final_state: Dict[str, Any], debug: bool) -> None:
+    """Write ``final_state`` as JSON, through orjson when it is installed.
 
-    return "\n\n".join(sections).strip()
+    Both paths produce the same document once parsed; only whitespace and
+    the escaping of non-ASCII text differ. NaN and infinities are written as
+    ``null`` (``json.dump`` would emit invalid JSON). Non-string dict keys
+    are left to the json path, which converts them with :func:`str`.
+    """
+
+    if orjson is not None:
+        # Dataclasses and datetimes are routed through _orjson_default so they
+        # serialise exactly as _make_json_safe does them.
+        option = orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+        if debug:
+            option |= orjson.OPT_INDENT_2
+        try:
+            path.write_bytes(orjson.dumps(final_state, default=_orjson_default, option=option))
+            return
+        except orjson.JSONEncodeError as exc:
+            # e.g. non-str keys or integers beyond 64 bits; the slow path copes.
+            LOGGER.debug("orjson could not encode final_state (%s); using json", exc)
+
+    safe_state = _make_json_safe(final_state)
+    # Stream straight to disk instead of materialising the whole document;
+    # the compact form is the default, pretty-printing is kept for debugging.
+    with path.open("w", encoding="utf-8") as fp:
+        if debug:
+            json.dump(safe_state, fp, indent=2)
+        else:
+            json.dump(safe_state, fp, separators=(",", ":"))
 
 
 def _write_outputs(
     ticker: str,
     run_time: datetime,
-    config: Dict[str, Any],
+    results_root: Path,
     final_state: Dict[str, Any],
     decision: Optional[str],
+    debug: bool = False,
 ) -> Tuple[Path, str]:
-    results_root = Path(config["results_dir"])
     analysis_date = run_time.strftime("%Y-%m-%d")
     timestamp_label = run_time.strftime("%H-%M")
-    report_dir = results_root / ticker / analysis_date / timestamp_label
-    report_dir.mkdir(parents=True, exist_ok=True)
+    report_dir = results_root.joinpath(ticker, analysis_date, timestamp_label)
+    reports_dir = report_dir / "reports"
+    # Creating the nested reports/ directory also creates report_dir.
+    reports_dir.mkdir(parents=True, exist_ok=True)
 
     summary_md = _build_report(final_state)
 
-    (report_dir / "final_report.md").write_text(summary_md, encoding="utf-8")
-
-    reports_dir = report_dir / "reports"
-    reports_dir.mkdir(parents=True, exist_ok=True)
-    (reports_dir / "final_report.md").write_text(summary_md, encoding="utf-8")
+    primary_report = report_dir / "final_report.md"
+    primary_report.write_text(summary_md, encoding="utf-8")
+    _link_or_copy(primary_report, reports_dir / "final_report.md")
 
     section_keys = [
         "market_report",
@@ -155,6 +226,7 @@ def _write_outputs(
         "trader_investment_plan",
         "final_trade_decision",
     ]
+    section_files: List[Tuple[Path, str]] = []
     for key in section_keys:
         content = final_state.get(key)
         if not content:
@@ -162,13 +234,19 @@ def _write_outputs(
         content_text = content.strip() if isinstance(content, str) else str(content)
         if not content_text:
             continue
-        (reports_dir / f"{key}.md").write_text(content_text, encoding="utf-8")
+        section_files.append((reports_dir / f"{key}.md", content_text))
+
+    if section_files:
+        # Overlap the per-section writes; matters on slow or network disks.
+        with ThreadPoolExecutor(max_workers=min(4, len(section_files))) as executor:
+            list(
+                executor.map(
+                    lambda item: item[0].write_text(item[1], encoding="utf-8"),
+                    section_files,
+                )
+            )
 
-    safe_state = _make_json_safe(final_state)
-    (report_dir / "final_state.json").write_text(
-        json.dumps(safe_state, indent=2),
-        encoding="utf-8",
-    )
+    _write_state_json(report_dir / "final_state.json", final_state, debug)
     if decision:
         (report_dir / "decision.txt").write_text(decision, encoding="utf-8")
 
@@ -187,56 +265,156 @@ def _format_console_summary(result: RunResult) -> str:
     return f"{base}\n  Error: {result.error}\n  Saved at: {result.report_dir}"
 
 
-def _make_json_safe(value: Any) -> Any:
-    from datetime import date
+# Maximum container nesting accepted by _make_json_safe. The json encoder
+# used afterwards recurses once per level, so this stays well below the
+# interpreter's default recursion limit (1000); deeper or circular
+# structures are rejected up front instead.
+_MAX_JSON_DEPTH = 500
 
-    if value is None or isinstance(value, (str, int, float, bool)):
-        return value
-    if isinstance(value, (datetime, date)):
-        return value.isoformat()
-    if isinstance(value, Path):
-        return str(value)
-    if isinstance(value, dict):
-        return {str(k): _make_json_safe(v) for k, v in value.items()}
-    if isinstance(value, (list, tuple, set)):
-        return [_make_json_safe(v) for v in value]
-    if is_dataclass(value):
-        return {k: _make_json_safe(v) for k, v in value.__dict__.items()}
+# Types already confirmed to be dataclasses, so ``is_dataclass`` runs once each.
+_DATACLASS_TYPES: set = set()
+
+_JsonNode = Tuple[Any, Optional[Iterable[Tuple[Any, Any]]]]
+
+
+@singledispatch
+def _json_safe_node(value: Any) -> _JsonNode:
+    """Convert ``value`` into ``(safe_value, children)``.
+
+    Containers return an empty shell (dict with placeholder keys or a list of
+    placeholders) plus the ``(key, child)`` pairs still to be converted.
+    """
+
+    fields = _object_fields(value)
+    if fields is None:
+        return str(value), None
+    return _mapping_node(fields, stringify_keys=False)
+
+
+def _object_fields(value: Any) -> Optional[Dict[Any, Any]]:
+    """Return the mapping used to serialise an arbitrary object, if any."""
+
+    cls = type(value)
+    if cls in _DATACLASS_TYPES or (is_dataclass(value) and not isinstance(value, type)):
+        _DATACLASS_TYPES.add(cls)
+        return value.__dict__
     if hasattr(value, "dict") and callable(getattr(value, "dict")):
         try:
-            return {k: _make_json_safe(v) for k, v in value.dict().items()}
+            return value.dict()
         except Exception:
             pass
     if hasattr(value, "__dict__") and value.__dict__:
-        return {k: _make_json_safe(v) for k, v in value.__dict__.items()}
+        return value.__dict__
     if hasattr(value, "content") and hasattr(value, "type"):
         return {
             "type": getattr(value, "type", "message"),
-            "content": _make_json_safe(getattr(value, "content", "")),
+            "content": getattr(value, "content", ""),
         }
-    return str(value)
+    return None
+
+
+def _orjson_default(value: Any) -> Any:
+    """``default`` hook for types orjson does not serialise natively."""
+
+    if isinstance(value, (date, dtime)):
+        return value.isoformat()
+    if isinstance(value, float):  # float subclasses, e.g. numpy.float64
+        return _finite_or_none(value)
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, set):
+        return list(value)
+    fields = _object_fields(value)
+    return str(value) if fields is None else fields
+
+
+def _mapping_node(mapping: Dict[Any, Any], stringify_keys: bool) -> _JsonNode:
+    items = [(str(k) if stringify_keys else k, v) for k, v in mapping.items()]
+    return dict.fromkeys(k for k, _ in items), items
+
+
+@_json_safe_node.register(type(None))
+@_json_safe_node.register(str)
+@_json_safe_node.register(int)
+def _json_safe_scalar(value: Any) -> _JsonNode:
+    return value, None
+
+
+def _finite_or_none(value: float) -> Optional[float]:
+    return float(value) if math.isfinite(value) else None
+
+
+@_json_safe_node.register(float)
+def _json_safe_float(value: float) -> _JsonNode:
+    return _finite_or_none(value), None
+
+
+@_json_safe_node.register(date)
+def _json_safe_date(value: date) -> _JsonNode:
+    return value.isoformat(), None
+
+
+@_json_safe_node.register(Path)
+def _json_safe_path(value: Path) -> _JsonNode:
+    return str(value), None
+
+
+@_json_safe_node.register(dict)
+def _json_safe_dict(value: Dict[Any, Any]) -> _JsonNode:
+    return _mapping_node(value, stringify_keys=True)
+
+
+@_json_safe_node.register(list)
+@_json_safe_node.register(tuple)
+@_json_safe_node.register(set)
+def _json_safe_sequence(value: Iterable[Any]) -> _JsonNode:
+    items = list(enumerate(value))
+    return [None] * len(items), items
+
+
+def _make_json_safe(value: Any) -> Any:
+    """Return a JSON-serialisable copy of ``value``.
+
+    Walks the structure with an explicit stack rather than recursion. Nesting
+    beyond ``_MAX_JSON_DEPTH`` (including circular references) raises
+    :class:`ValueError`, so anything returned can be handed to ``json.dump``.
+    """
+
+    root: List[Any] = [None]
+    stack: List[Tuple[Any, Any, Any, int]] = [(root, 0, value, 0)]
+    while stack:
+        parent, key, node, depth = stack.pop()
+        safe, children = _json_safe_node(node)
+        parent[key] = safe
+        if children:
+            if depth >= _MAX_JSON_DEPTH:
+                raise ValueError(
+                    f"final_state is nested more than {_MAX_JSON_DEPTH} levels deep "
+                    "(circular reference?)"
+                )
+            # Reversed so children are converted in their original order.
+            stack.extend(
+                (safe, child_key, child, depth + 1)
+                for child_key, child in reversed(children)
+            )
+    return root[0]
 
 
 def _gather_email_config(config: Dict[str, Any]) -> Dict[str, Any]:
     email_cfg = config.get("email", {})
-    enabled = str(email_cfg.get("enabled", "false")).lower() in {"1", "true", "yes", "on"}
     return {
-        "enabled": enabled,
+        "enabled": as_bool(email_cfg.get("enabled", "false")),
         "host": email_cfg.get("host"),
         "port": int(email_cfg.get("port", 587)),
         "username": email_cfg.get("username"),
         "password": email_cfg.get("password"),
         "from": email_cfg.get("from"),
         "to": _ensure_list(email_cfg.get("to"), []),
-        "use_ssl": str(email_cfg.get("use_ssl", "false")).lower() in {"1", "true", "yes", "on"},
+        "use_ssl": as_bool(email_cfg.get("use_ssl", "false")),
     }
 
 
-def _send_email(email_config: Dict[str, Any], subject: str, html_body: str) -> None:
-    if not email_config.get("enabled"):
-        LOGGER.info("Email delivery disabled; skipping notification")
-        return
-
+def _validate_email_config(email_config: Dict[str, Any]) -> None:
     missing = [
         key
         for key in ("host", "username", "password", "from")
@@ -249,47 +427,95 @@ def _send_email(email_config: Dict[str, Any], subject: str, html_body: str) -> N
     if not email_config.get("to"):
         raise ValueError("Email delivery enabled but no recipients provided")
 
+
+def _build_email_message(
+    email_config: Dict[str, Any], subject: str, html_body: str
+) -> "MIMEMultipart":
+    from email.mime.multipart import MIMEMultipart
+    from email.mime.text import MIMEText
+
     message = MIMEMultipart("alternative")
     message["Subject"] = subject
     message["From"] = email_config["from"]
     message["To"] = ", ".join(email_config["to"])
     message.attach(MIMEText(html_body, "html", "utf-8"))
+    return message
+
+
+def _send_email_batch(
+    email_config: Dict[str, Any], messages: Sequence[Tuple[str, str]]
+) -> List[Optional[Exception]]:
+    """Send ``(subject, html_body)`` pairs over a single SMTP session.
+
+    Connection and authentication problems raise. Failures of individual
+    messages are returned instead, one entry per message (``None`` on
+    success), so the remaining messages are still delivered.
+    """
+
+    if not email_config.get("enabled"):
+        LOGGER.info("Email delivery disabled; skipping notification")
+        return [None] * len(messages)
+    if not messages:
+        return []
+
+    import smtplib
+    import ssl
+
+    _validate_email_config(email_config)
 
     if email_config.get("use_ssl"):
         context = ssl.create_default_context()
-        with smtplib.SMTP_SSL(
+        server = smtplib.SMTP_SSL(
             email_config["host"], email_config.get("port", 465), context=context
-        ) as server:
-            server.login(email_config["username"], email_config["password"])
-            server.send_message(message)
+        )
     else:
-        with smtplib.SMTP(email_config["host"], email_config.get("port", 587)) as server:
+        server = smtplib.SMTP(email_config["host"], email_config.get("port", 587))
+
+    outcomes: List[Optional[Exception]] = []
+    with server:
+        if not email_config.get("use_ssl"):
             server.ehlo()
             server.starttls(context=ssl.create_default_context())
-            server.login(email_config["username"], email_config["password"])
-            server.send_message(message)
+        server.login(email_config["username"], email_config["password"])
+        for subject, html_body in messages:
+            try:
+                server.send_message(_build_email_message(email_config, subject, html_body))
+            except Exception as exc:
+                outcomes.append(exc)
+            else:
+                outcomes.append(None)
+    return outcomes
+
+
+def _send_email(email_config: Dict[str, Any], subject: str, html_body: str) -> None:
+    for error in _send_email_batch(email_config, [(subject, html_body)]):
+        if error is not None:
+            raise error
 
 
 def _markdown_to_html(md: Optional[str]) -> str:
     if not md:
         return "<p><em>No hay informe disponible.</em></p>"
 
+    # Escaping never touches "#", spaces or line breaks, so the whole report
+    # can be escaped once instead of line by line. html.escape (a few C-level
+    # str.replace calls) is also much faster here than str.translate with
+    # multi-character replacements. A single re.sub pass over the lines was
+    # tried and benchmarked slower than this loop (1.4-1.9x on 3 MB reports).
     lines = []
-    for raw_line in md.splitlines():
+    for raw_line in html.escape(md).splitlines():
         line = raw_line.rstrip()
         if not line:
-            lines.append("")
             continue
         if line.startswith("### "):
-            lines.append(f"<h3>{html.escape(line[4:])}</h3>")
+            lines.append(f"<h3>{line[4:]}</h3>")
         elif line.startswith("## "):
-            lines.append(f"<h2>{html.escape(line[3:])}</h2>")
+            lines.append(f"<h2>{line[3:]}</h2>")
         elif line.startswith("# "):
-            lines.append(f"<h1>{html.escape(line[2:])}</h1>")
+            lines.append(f"<h1>{line[2:]}</h1>")
         else:
-            lines.append(f"<p>{html.escape(line)}</p>")
+            lines.append(f"<p>{line}</p>")
 
-    # Ensure paragraphs separated nicely
     body = "".join(lines)
     return f"<div>{body}</div>"
 
@@ -325,14 +551,8 @@ def _build_result_email_body(result: RunResult) -> str:
 
 def _gather_whatsapp_config(config: Dict[str, Any]) -> Dict[str, Any]:
     whatsapp_cfg = config.get("whatsapp", {})
-    enabled = str(whatsapp_cfg.get("enabled", "false")).lower() in {
-        "1",
-        "true",
-        "yes",
-        "on",
-    }
     return {
-        "enabled": enabled,
+        "enabled": as_bool(whatsapp_cfg.get("enabled", "false")),
         "access_token": whatsapp_cfg.get("access_token"),
         "phone_number_id": whatsapp_cfg.get("phone_number_id"),
         "to": _ensure_list(whatsapp_cfg.get("to"), []),
@@ -359,6 +579,46 @@ def _build_whatsapp_message(run_time: datetime, results: Sequence[RunResult]) ->
     return "\n".join(lines)
 
 
+_WHATSAPP_SESSION: Optional["requests.Session"] = None
+# Upper bound on concurrent sends; also the size of the session's pool.
+_WHATSAPP_MAX_CONCURRENCY = 4
+
+
+def _get_whatsapp_session() -> "requests.Session":
+    """Return the shared Graph API session, creating it on first use."""
+
+    global _WHATSAPP_SESSION
+    if _WHATSAPP_SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        # Sending a message is not idempotent: only retry when the request
+        # cannot have been processed (connect errors, 429/502/503), never
+        # after a read timeout or a 500/504 that may already have delivered.
+        retry = Retry(
+            total=3,
+            read=0,
+            other=0,
+            backoff_factor=0.5,
+            status_forcelist=(429, 502, 503),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        )
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=_WHATSAPP_MAX_CONCURRENCY,
+                max_retries=retry,
+            ),
+        )
+        session.headers["Content-Type"] = "application/json"
+        _WHATSAPP_SESSION = session
+    return _WHATSAPP_SESSION
+
+
 def _send_whatsapp_message(whatsapp_config: Dict[str, Any], body: str) -> None:
     if not whatsapp_config.get("enabled"):
         LOGGER.info("Notificaciones WhatsApp desactivadas; se omite el envío")
@@ -379,23 +639,35 @@ def _send_whatsapp_message(whatsapp_config: Dict[str, Any], body: str) -> None:
     url = (
         f"https://graph.facebook.com/v20.0/{whatsapp_config['phone_number_id']}/messages"
     )
-    headers = {
-        "Authorization": f"Bearer {whatsapp_config['access_token']}",
-        "Content-Type": "application/json",
-    }
+    session = _get_whatsapp_session()
+    # Per request, not on the shared session: tokens can differ per scheduler.
+    headers = {"Authorization": f"Bearer {whatsapp_config['access_token']}"}
 
-    for recipient in whatsapp_config["to"]:
+    def send(recipient: str) -> Optional[str]:
         payload = {
             "messaging_product": "whatsapp",
             "to": recipient,
             "type": "text",
             "text": {"preview_url": False, "body": body},
         }
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        try:
+            response = session.post(url, headers=headers, json=payload, timeout=30)
+        except Exception as exc:
+            return f"Error al enviar WhatsApp a {recipient}: {exc}"
         if not response.ok:
-            raise ValueError(
+            return (
                 f"Error al enviar WhatsApp a {recipient}: {response.status_code} {response.text}"
             )
+        return None
+
+    recipients = whatsapp_config["to"]
+    # Recipients are independent, so fan out over the pooled session instead
+    # of waiting on each Graph API round-trip in turn.
+    max_workers = min(len(recipients), _WHATSAPP_MAX_CONCURRENCY)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        errors = [error for error in executor.map(send, recipients) if error]
+    if errors:
+        raise ValueError("; ".join(errors))
 
 
 class TradingAgentsScheduler:
@@ -408,61 +680,41 @@ class TradingAgentsScheduler:
         selected_analysts: Optional[Sequence[str]] = None,
         debug: bool = False,
     ):
-        self.config = (config or DEFAULT_CONFIG).copy()
+        self.config = copy.deepcopy(config) if config else build_default_config()
         self.debug = debug
+        self.results_root = Path(self.config["results_dir"])
+        schedule_cfg = self.config.get("schedule")
+        if not isinstance(schedule_cfg, dict):
+            schedule_cfg = None
+
+        # Resolved lazily by the cached properties below.
+        self._tickers_override = tickers
+        self._analysts_override = selected_analysts
 
-        if tickers:
-            self.tickers = list(tickers)
-        else:
-            configured_tickers = self.config.get("tickers")
-            if isinstance(configured_tickers, str):
-                self.tickers = _ensure_list(
-                    configured_tickers,
-                    ["CL=F", "EURUSD=X"],
-                )
-            elif isinstance(configured_tickers, Iterable):
-                self.tickers = list(configured_tickers)
-            else:
-                self.tickers = ["CL=F", "EURUSD=X"]
         env_schedule = parse_schedule_times(
-            self.config.get("schedule", {}).get("times")
-            if isinstance(self.config.get("schedule"), dict)
+            schedule_cfg.get("times")
+            if schedule_cfg is not None
             else os.getenv("TRADINGAGENTS_SCHEDULE_TIMES")
         )
         if schedule_times is not None:
             self.schedule_times = sorted(schedule_times)
         elif env_schedule:
-            self.schedule_times = env_schedule
+            self.schedule_times = list(env_schedule)
         else:
             self.schedule_times = []
         tz_name = (
             timezone
-            or (
-                self.config.get("schedule", {}).get("timezone")
-                if isinstance(self.config.get("schedule"), dict)
-                else None
-            )
+            or (schedule_cfg.get("timezone") if schedule_cfg is not None else None)
             or os.getenv("TRADINGAGENTS_TIMEZONE", "Europe/Madrid")
         )
-        self.timezone = pytz.timezone(tz_name)
-        cfg_analysts = (
-            selected_analysts
-            or self.config.get("selected_analysts")
-            or ["market", "social", "news", "fundamentals"]
-        )
-        self.selected_analysts = list(cfg_analysts)
+        self.timezone = ZoneInfo(tz_name)
+        # Gathered eagerly so malformed notifier settings (e.g. a non-numeric
+        # email port) fail here, at startup, rather than after a batch.
         self.email_config = _gather_email_config(self.config)
         self.whatsapp_config = _gather_whatsapp_config(self.config)
-        self.skip_weekends = (
-            self.config.get("schedule", {}).get("skip_weekends")
-            if isinstance(self.config.get("schedule"), dict)
-            else False
-        ) or os.getenv("TRADINGAGENTS_SKIP_WEEKENDS", "false").lower() in {
-            "true",
-            "1",
-            "yes",
-            "on",
-        }
+        self.skip_weekends = as_bool(
+            schedule_cfg.get("skip_weekends", False) if schedule_cfg is not None else False
+        ) or as_bool(os.getenv("TRADINGAGENTS_SKIP_WEEKENDS", "false"))
 
         if not self.schedule_times:
             raise ValueError(
@@ -470,13 +722,66 @@ class TradingAgentsScheduler:
                 "o pasa schedule_times directamente."
             )
 
+        self.max_parallel = max(1, int(self.config.get("max_parallel_tickers", 4)))
+        if self.config.get("ace_enabled", True) and self.max_parallel > 1:
+            # Every graph loads the shared skillbook on creation and writes it
+            # back whole after learning, so concurrent tickers would overwrite
+            # each other's lessons. Keep ACE runs sequential.
+            LOGGER.info(
+                "ACE activado: los tickers se ejecutarán de uno en uno "
+                "(se ignora max_parallel_tickers=%s)",
+                self.max_parallel,
+            )
+            self.max_parallel = 1
+        # Set by stop() (or SIGTERM) to interrupt the wait for the next run.
+        self._stop = threading.Event()
+
+        # Min-heap of (next_run, time_of_day) so each wake-up only reschedules
+        # the entry that just fired instead of recomputing every candidate.
+        now = datetime.now(self.timezone)
+        self._upcoming: List[Tuple[datetime, dtime]] = []
+        for run_time in set(self.schedule_times):
+            self._push_next_run(now, run_time)
+
+    @cached_property
+    def tickers(self) -> List[str]:
+        if self._tickers_override:
+            return list(self._tickers_override)
+        configured_tickers = self.config.get("tickers")
+        if isinstance(configured_tickers, str):
+            return _ensure_list(configured_tickers, ["CL=F", "EURUSD=X"])
+        if isinstance(configured_tickers, Iterable):
+            return list(configured_tickers)
+        return ["CL=F", "EURUSD=X"]
+
+    @cached_property
+    def selected_analysts(self) -> List[str]:
+        return list(
+            self._analysts_override
+            or self.config.get("selected_analysts")
+            or ["market", "social", "news", "fundamentals"]
+        )
+
+    def _push_next_run(self, after: datetime, run_time: dtime) -> None:
+        heapq.heappush(
+            self._upcoming,
+            (
+                next_run_after(after, run_time, self.timezone, skip_weekends=self.skip_weekends),
+                run_time,
+            ),
+        )
+
     def _run_single_ticker(self, ticker: str, run_time: datetime) -> RunResult:
-        config = self.config.copy()
+        config = copy.deepcopy(self.config)
         try:
+            # Imported here so that loading the scheduler (and LangChain/LLM
+            # clients behind the graph) is only paid for when a run executes.
+            from tradingagents.graph.trading_graph import TradingAgentsGraph
+
             # ACE settings from config
             ace_enabled = config.get("ace_enabled", True)
             ace_skillbook_path = config.get("ace_skillbook_path") or str(
-                Path(config["results_dir"]) / "ace_skillbook.json"
+                self.results_root / "ace_skillbook.json"
             )
             
             graph = TradingAgentsGraph(
@@ -500,9 +805,10 @@ class TradingAgentsScheduler:
             report_dir, report_md = _write_outputs(
                 ticker=ticker,
                 run_time=run_time,
-                config=config,
+                results_root=self.results_root,
                 final_state=final_state,
                 decision=decision,
+                debug=self.debug,
             )
             
             # Save ACE skillbook after execution (persists learned strategies)
@@ -523,7 +829,7 @@ class TradingAgentsScheduler:
             )
         except Exception as exc:  # pragma: no cover - dependent on external APIs
             LOGGER.exception("Error executing ticker %s", ticker)
-            report_dir = Path(config["results_dir"]) / ticker / run_time.strftime("%Y-%m-%d")
+            report_dir = self.results_root.joinpath(ticker, run_time.strftime("%Y-%m-%d"))
             report_dir.mkdir(parents=True, exist_ok=True)
             return RunResult(
                 ticker=ticker,
@@ -537,14 +843,20 @@ class TradingAgentsScheduler:
 
     def run_pending(self) -> None:
         now = datetime.now(self.timezone)
-        next_runs = [
-            next_run_after(now, t, self.timezone, skip_weekends=self.skip_weekends)
-            for t in self.schedule_times
-        ]
-        next_run = min(next_runs)
-        sleep_seconds = max(0, (next_run - now).total_seconds())
+        next_run, run_time = heapq.heappop(self._upcoming)
+        # Entries that went stale while a previous batch was running are
+        # skipped, matching a fresh next_run_after() computed from ``now``.
+        while next_run <= now:
+            self._push_next_run(now, run_time)
+            next_run, run_time = heapq.heappop(self._upcoming)
+        # Both share one ZoneInfo, so ``next_run - now`` would compare wall
+        # clocks and be off by an hour across a DST change; use POSIX time.
+        sleep_seconds = max(0.0, next_run.timestamp() - now.timestamp())
         LOGGER.info("Próxima ejecución programada para %s", next_run.isoformat())
-        time.sleep(sleep_seconds)
+        if self._stop.wait(sleep_seconds):
+            heapq.heappush(self._upcoming, (next_run, run_time))
+            return
+        self._push_next_run(next_run, run_time)
         self._execute_batch(next_run)
 
     def _execute_batch(self, run_time: datetime) -> None:
@@ -553,54 +865,130 @@ class TradingAgentsScheduler:
             ", ".join(self.tickers),
             run_time.isoformat(),
         )
-        results: List[RunResult] = []
-        for ticker in self.tickers:
-            result = self._run_single_ticker(ticker, run_time)
-            results.append(result)
-            print(_format_console_summary(result))
-
+        results_by_ticker: Dict[str, RunResult] = {}
+        max_workers = max(1, min(len(self.tickers), self.max_parallel))
+        if max_workers == 1:
+            # No pool for sequential runs (the ACE default): Ctrl-C then
+            # escapes the running ticker at once, as it always did.
+            for ticker in self.tickers:
+                result = self._run_unless_stopped(ticker, run_time)
+                if result is None:
+                    break
+                results_by_ticker[ticker] = result
+                print(_format_console_summary(result))
+        else:
+            executor = ThreadPoolExecutor(max_workers=max_workers)
+            try:
+                futures = {
+                    executor.submit(self._run_unless_stopped, ticker, run_time): ticker
+                    for ticker in self.tickers
+                }
+                for future in as_completed(futures):
+                    result = future.result()
+                    if result is None:
+                        continue
+                    results_by_ticker[futures[future]] = result
+                    print(_format_console_summary(result))
+            except BaseException:
+                # Leaving a ``with`` block would wait for every queued ticker
+                # before a KeyboardInterrupt reached run_forever; drop them.
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            executor.shutdown()
+
+        if not results_by_ticker:
+            return
+        # Notifications keep the configured ticker order.
+        results = [
+            results_by_ticker[ticker] for ticker in self.tickers if ticker in results_by_ticker
+        ]
         self._send_notifications(run_time, results)
 
+    def _run_unless_stopped(self, ticker: str, run_time: datetime) -> Optional[RunResult]:
+        if self._stop.is_set():
+            LOGGER.info("Scheduler detenido; se omite %s", ticker)
+            return None
+        return self._run_single_ticker(ticker, run_time)
+
     def run_forever(self) -> None:
         LOGGER.info(
             "Iniciando scheduler con tickers %s en zona horaria %s",
             ", ".join(self.tickers),
             self.timezone,
         )
+        previous_handler = None
+        if threading.current_thread() is threading.main_thread():
+            previous_handler = signal.signal(
+                signal.SIGTERM, lambda *_: self._stop.set()
+            )
         try:
-            while True:
+            while not self._stop.is_set():
                 self.run_pending()
+            LOGGER.info("Scheduler detenido")
         except KeyboardInterrupt:
             LOGGER.info("Scheduler detenido por el usuario")
+        finally:
+            if previous_handler is not None:
+                signal.signal(signal.SIGTERM, previous_handler)
+
+    def stop(self) -> None:
+        """Ask :meth:`run_forever` to return once the running tickers finish.
+
+        Tickers of the current batch that have not started yet are skipped.
+        """
+
+        self._stop.set()
 
     def _send_notifications(
         self, run_time: datetime, results: Sequence[RunResult]
     ) -> None:
         errors = []
 
-        if self.whatsapp_config.get("enabled"):
-            try:
+        # Each channel only builds its message body once it is known to be
+        # enabled; config problems are reported like any other send failure.
+        try:
+            if self.whatsapp_config.get("enabled"):
                 body = _build_whatsapp_message(run_time, results)
                 _send_whatsapp_message(self.whatsapp_config, body)
-            except Exception as exc:  # pragma: no cover - depende servicios externos
-                LOGGER.exception("No fue posible enviar WhatsApp: %s", exc)
-                errors.append(f"WhatsApp: {exc}")
+        except Exception as exc:  # pragma: no cover - depende servicios externos
+            LOGGER.exception("No fue posible enviar WhatsApp: %s", exc)
+            errors.append(f"WhatsApp: {exc}")
 
         if self.email_config.get("enabled"):
+            pending: List[RunResult] = []
+            messages: List[Tuple[str, str]] = []
             for result in results:
                 try:
                     subject = (
                         f"TradingAgents - {result.ticker} - "
                         f"{result.run_timestamp.strftime('%Y-%m-%d %H:%M')}"
                     )
-                    body = _build_result_email_body(result)
-                    _send_email(self.email_config, subject, body)
-                except Exception as exc:  # pragma: no cover - dependent on SMTP setup
+                    messages.append((subject, _build_result_email_body(result)))
+                    pending.append(result)
+                except Exception as exc:  # pragma: no cover - defensive branch
                     LOGGER.exception(
                         "No fue posible enviar el correo para %s: %s", result.ticker, exc
                     )
                     errors.append(f"Email {result.ticker}: {exc}")
 
+            try:
+                # One SMTP connection (TLS + login) for the whole batch.
+                outcomes = _send_email_batch(self.email_config, messages)
+            except Exception as exc:
+                LOGGER.exception("No fue posible enviar los correos: %s", exc)
+                errors.append(f"Email: {exc}")
+                outcomes = []
+            for result, error in zip(pending, outcomes):
+                if error is None:
+                    continue
+                LOGGER.error(
+                    "No fue posible enviar el correo para %s: %s",
+                    result.ticker,
+                    error,
+                    exc_info=error,
+                )
+                errors.append(f"Email {result.ticker}: {error}")
+
         if errors:
             LOGGER.warning("Errores durante el envío de notificaciones: %s", "; ".join(errors))
 